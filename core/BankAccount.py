@@ -1,8 +1,82 @@
 from core.User import User
-from decimal import Decimal
-from core.Operations import Operation
+from collections import deque
+from collections.abc import Sequence
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, Context, Decimal
+from itertools import count
+
+# счётчик в C-коде вместо global + int на каждый вызов
+_next_id = count(1).__next__
+
+# Суммы внутри хранятся целым числом копеек: сложение int намного быстрее Decimal.
+# Decimal остаётся только на границе API.
+# Правило округления денег одно: суммы от пользователя должны быть точными (до копейки),
+# вычисленные суммы (проценты) округляются до копейки по-банковски (половина - к чётному), см. _div_round.
+_SCALE_DIGITS = 2
+_SCALE = 10 ** _SCALE_DIGITS
+# контекст без ограничения точности: перевод копеек в Decimal не должен округлять большие суммы
+_EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+def _to_minor(value: Decimal) -> int:
+    '''Decimal -> целое число копеек. Сумма не округляется: дробные копейки - ошибка.
+
+    Raises:
+        ValueError: Если value не конечное число или содержит доли копейки.
+    '''
+    if not value.is_finite():
+        raise ValueError("value must be a finite number")
+    # точная дробь вместо умножения Decimal: оно идёт в контексте на 28 знаков и округляет большие суммы
+    num, den = value.as_integer_ratio()
+    scaled = num * _SCALE
+    if scaled % den:
+        raise ValueError("value must be a whole number of kopecks")
+    return scaled // den
+
+
+def _div_round(numerator: int, denominator: int) -> int:
+    '''numerator / denominator, округлённое до целого по-банковски (половина - к чётному). denominator > 0'''
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+
+def _from_minor(value_int: int) -> Decimal:
+    '''целое число копеек -> Decimal, без округления при любой величине'''
+    return Decimal(value_int).scaleb(-_SCALE_DIGITS, _EXACT_CONTEXT)
+
+
+class _HistoryView:
+    """Представление истории операций только для чтения.
+    Строки операций получаются при обращении, копия строк не создаётся. Видит новые операции счёта.
+    """
+
+    __slots__ = ('_operations',)
+
+    def __init__(self, operations):
+        self._operations = operations
+
+    def __iter__(self):
+        # tuple - снимок ссылок на операции: проведение операций во время обхода не ломает итерацию
+        return (str(operation) for operation in tuple(self._operations))
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice): # deque не поддерживает срезы
+            return [str(operation) for operation in list(self._operations)[index]]
+        return str(self._operations[index])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _HistoryView) or (isinstance(other, Sequence) and not isinstance(other, str)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
 
-id_counter = 0
 
 class BankAccount:
     """Расчётный счёт.
@@ -11,12 +85,19 @@ class BankAccount:
         id (str): Уникальный идентификатор счета. (readonly)
         user (User): Объект пользователя, владеющего счетом. (readonly)
         balance (Decimal): Текущий баланс счета. (readonly)
-        operations_history (list): История проведенных операций. (readonly)
+        operations_history (Sequence[str]): История проведенных операций в виде строк. (readonly)
+            Это не копия, а живое представление: len и индексы видят операции, проведённые позже.
+            Обход идёт по снимку истории на момент начала. Сравнивается со списками строк через ==.
     """
-    def __init__(self, user: User):
+
+    # без __dict__: меньше памяти на объект и быстрее доступ к атрибутам
+    __slots__ = ('__id', '__user', '_balance_int', '_operations_history')
+
+    def __init__(self, user: User, history_maxlen: int | None = None):
         """
         Args:
             user (User): Объект пользователя, владеющего счетом.
+            history_maxlen (int | None): Сколько последних операций хранить в истории. None - без ограничения.
 
         Raises:
             ValueError: Если user не является экземпляром класса User.
@@ -24,13 +105,13 @@ class BankAccount:
         if not isinstance(user, User):
             raise ValueError("user must be instance of user class")
 
-        id_counter += 1 # уникальный id
-        self.__id = id_counter
+        self.__id = _next_id() # уникальный id
         self.__user = user
-        # Баланс делается через Decimal для точности в расчётах.
+        # Баланс хранится в копейках (int), наружу отдаётся Decimal для точности в расчётах.
         # balance и history через safe вместо private, чтобы изменять через класс операций
-        self._balance = Decimal('0')
-        self._operations_history = []
+        self._balance_int = 0
+        # deque: append без перевыделения памяти, при maxlen старые операции вытесняются
+        self._operations_history = deque(maxlen=history_maxlen)
 
     @property
     def id(self) -> int:
@@ -42,15 +123,33 @@ class BankAccount:
 
     @property
     def balance(self) -> Decimal:
-        return self._balance
+        return _from_minor(self._balance_int)
     
     @property
-    def operations_history(self) -> list[Operation]:
-        # клон списка, чтобы нельзя было изменить вручную
-        result = []
-        for operation in self._operations_history:
-            result.append(str(operation))
-        return result
+    def operations_history(self) -> _HistoryView:
+        # представление только для чтения вместо копии, чтобы нельзя было изменить вручную
+        return _HistoryView(self._operations_history)
+
+    def history_text(self, sep: str = '\n') -> str:
+        """История операций одной строкой, без промежуточного списка строк.
+
+        Args:
+            sep (str): Разделитель между операциями.
+
+        Returns:
+            str: Строковые представления операций, соединённые через sep.
+        """
+        return sep.join(str(operation) for operation in self._operations_history)
+
+    def _apply_batch(self, operations, value_int: int):
+        """Записывает пачку уже проверенных операций: одно изменение баланса и один extend истории.
+
+        Args:
+            operations (list[Operation]): Проводимые операции.
+            value_int (int): Суммарное изменение баланса в копейках.
+        """
+        self._balance_int += value_int
+        self._operations_history.extend(operations)
 
     def __str__(self):
         """Строковое представление банковского счета.
@@ -1,11 +1,50 @@
-from abc import ABC, abstractmethod
-from core.BankAccount import BankAccount
+from core.BankAccount import BankAccount, _to_minor, _from_minor, _div_round
 from decimal import Decimal
+from enum import IntEnum
+from itertools import count
 
-operation_id_counter = 0
+try:
+    import numpy as np
+except ImportError: # numpy не обязателен, без него проценты считаются обычным циклом
+    np = None
 
-class Operation(ABC):
+_next_op_id = count(1).__next__
+
+_INT64_MAX = 2 ** 63 - 1
+
+
+class Status(IntEnum):
+    '''Статус операции. Внутри хранится int, чтобы проверки в execute/undo были сравнением чисел, а не строк.'''
+    INIT = 0
+    ERROR = 1
+    DONE = 2
+    UNDONE = 3
+
+
+# Внутри статус хранится обычным int: чтение Status.X - медленный поиск атрибута класса enum,
+# а глобальная константа читается одной инструкцией. Status нужен только для публичного свойства status.
+_INIT, _ERROR, _DONE, _UNDONE = int(Status.INIT), int(Status.ERROR), int(Status.DONE), int(Status.UNDONE)
+
+# буквенные статусы для публичного свойства status
+_STATUS_CHARS = {Status.INIT: 'I', Status.ERROR: 'E', Status.DONE: 'D', Status.UNDONE: 'U'}
+
+
+def _interest_deltas(balances: list[int], num: int, den: int) -> list[int]:
+    '''Проценты в копейках для каждого баланса: balance * num / den с округлением как в _div_round.
+    С numpy считается одной операцией над массивом int64, если результат туда помещается.'''
+    # границу считаем на int Python: np.abs(-2**63) в int64 переполняется
+    if np is not None and balances and den <= _INT64_MAX // 2 \
+            and max(map(abs, balances)) * abs(num) <= _INT64_MAX:
+        quotient, remainder = np.divmod(np.array(balances, dtype=np.int64) * num, den)
+        twice = 2 * remainder
+        quotient += (twice > den) | ((twice == den) & (quotient & 1 == 1))
+        return quotient.tolist()
+    return [_div_round(balance * num, den) for balance in balances]
+
+
+class Operation:
     """Абстрактный класс для всех финансовых операций с банковскими счетами.
+    Без ABC: абстрактные методы просто бросают NotImplementedError, isinstance не идёт через ABCMeta.
     
     Attributes:
         id (int): уникальный идентефикатор (readonly)
@@ -13,34 +52,41 @@ class Operation(ABC):
         content (str): комментарий к операции (readonly)
     """
 
-    __content = ''
+    # _str_cache - готовая строка для __str__, заполняется в наследниках
+    __slots__ = ('__id', '__status', '__content', '_str_cache')
 
     def __init__(self, content=''):
-        operation_id_counter += 1
-        self.__id = operation_id_counter
+        self.__id = _next_op_id()
 
-        self.__status = 'I'
+        self.__status = _INIT
         self.__content = content
 
-    @abstractmethod
+    @classmethod
+    def _unchecked(cls, *args, **kwargs):
+        """Создаёт операцию без проверок типов, для доверенного кода (массовое проведение, пересчёт истории).
+
+        Аргументы передаются в _init наследника, суммы - в копейках.
+        """
+        operation = cls.__new__(cls)
+        operation._init(*args, **kwargs)
+        return operation
+
     def execute(self, *args, **kwargs):
         """Абстрактный метод для выполнения операции.
         
         Принимает переменное количество аргументов, зависящих от типа операции.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def undo(self, *args, **kwargs):
         """Абстрактный метод для отмены операции.
 
         Принимает переменное количество аргументов, зависящих от типа операции.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def __str__(self):
-        pass
+        raise NotImplementedError
 
     @property
     def id(self) -> int:
@@ -49,7 +95,7 @@ class Operation(ABC):
     @property
     def status(self) -> str:
         # чтобы нельзя было изменять вручную
-        return self.__status
+        return _STATUS_CHARS[self.__status]
     
     @property
     def content(self) -> str:
@@ -57,151 +103,192 @@ class Operation(ABC):
         return self.__content
 
 
-class DepositOperation(Operation):
-    """Операция пополнения счёта.
-    
+class PostingOperation(Operation):
+    """Проводка по счёту на сумму со знаком: положительная - пополнение, отрицательная - списание.
+    Пополнение и снятие выполняются одним и тем же кодом execute/undo.
+    Поведение задаёт флаг класса _CHECK_OVERDRAFT, а не знак суммы:
+    с проверкой (снятие) операция не выполняется, если баланс после неё будет отрицательным, при любом знаке;
+    без проверки (пополнение) операция проводится всегда, а отмена предупреждает об отрицательном счёте.
+
     Attributes:
-        bank_account (BankAccount): Аккаунт, на который производится депозит. (readonly)
-        value (Decimal): сколько денег (readonly)
+        bank_account (BankAccount): Аккаунт, по которому проводится операция. (readonly)
+        value (Decimal): сколько денег, со знаком (readonly)
     """
 
+    __slots__ = ('__bank_account', '__value_int')
+
+    _CLASS_TAG = ': PostingOperation' # хвост строки для __str__
+    _CHECK_OVERDRAFT = True # операция не может оставить баланс отрицательным
+
     def __init__(self, bank_account: BankAccount, value: Decimal, content=''):
         """
         Args:
-            bank_account (BankAccount): Объект счёта, который будет пополняться.
+            bank_account (BankAccount): Объект счёта, по которому проводится операция.
 
         Raises:
             ValueError: Если bank_account не является экземпляром класса BankAccount.
             ValueError: Если value не является экземпляром класса Decimal.
+            ValueError: Если value не конечное число или содержит доли копейки.
         """
         if not isinstance(bank_account, BankAccount):
             raise ValueError("bank_account must be instance of BankAccount class")
         if not isinstance(value, Decimal):
             raise ValueError("value must be instance of Decimal class")
-        
-        super().__init__(content=content)
+
+        self._init(bank_account, _to_minor(value), content)
+
+    def _init(self, bank_account: BankAccount, value_int: int, content=''):
+        Operation.__init__(self, content=content)
+        # id и тип операции не меняются, строку можно собрать один раз
+        self._str_cache = str(self.id) + self._CLASS_TAG
 
         self.__bank_account = bank_account
-        self.__value = value
+        self.__value_int = value_int # в копейках, со знаком
+
+    @classmethod
+    def _unchecked(cls, bank_account: BankAccount, value_int: int, content=''):
+        if not content:
+            return cls._cheap(bank_account, value_int)
+        return super()._unchecked(bank_account, value_int, content)
+
+    @classmethod
+    def _cheap(cls, bank_account: BankAccount, value_int: int):
+        """Частый случай _unchecked - операция без комментария, без разбора *args/**kwargs.
+        Слоты заполняет тот же _init, что и у конструктора.
+
+        Args:
+            bank_account (BankAccount): Объект счёта.
+            value_int (int): Сумма в копейках.
+        """
+        operation = cls.__new__(cls)
+        operation._init(bank_account, value_int)
+        return operation
 
     def execute(self):
-        """Выполняет пополнение счета.
-        Увеличивает баланс указанного счета на заданную сумму и записывает операцию.
+        """Выполняет проводку: изменяет баланс счёта на сумму со знаком и записывает операцию.
+        Если включён _CHECK_OVERDRAFT, операция, после которой баланс станет отрицательным, не выполняется.
 
         Returns:
             bool: True, если операция выполнена успешно.
         """
-        if self.status != 'I': # операция уже выполнена
+        if self._Operation__status != _INIT: # операция уже выполнена
             return False
-        self.bank_account._balance += self.value
-        self.bank_account._operation_history.append(self)
-        self.__status = 'D'
+        bank_account = self.__bank_account
+        value_int = self.__value_int
+
+        new_balance = bank_account._balance_int + value_int
+        if new_balance < 0 and self._CHECK_OVERDRAFT: # баланс ушёл бы в минус
+            self._Operation__status = _ERROR
+            return False
+        bank_account._balance_int = new_balance
+        bank_account._operations_history.append(self)
+        self._Operation__status = _DONE
         return True
 
     def undo(self):
-        """Отменяет операцию пополнения счета.
-        Уменьшает баланс счета на ранее внесенную сумму. Уведомляет, если операция приводит к отрицательному счёту.
+        """Отменяет проводку, возвращая баланс счёта на сумму со знаком назад.
+        Для операций без проверки остатка (пополнений) уведомляет, если после отмены счёт отрицательный.
 
         Returns:
             bool: True, если операция выполнена успешно.
         """
-        if self.status != 'D': # операция не выполнена или отменена
+        if self._Operation__status != _DONE: # операция не выполнена или отменена
             return False
-        self.bank_account._balance -= self.value
-        self.__status = 'U'
+        bank_account = self.__bank_account
+        value_int = self.__value_int
+        bank_account._balance_int -= value_int
+        self._Operation__status = _UNDONE
 
-        if self.bank_account._balance < 0:
+        if bank_account._balance_int < 0 and not self._CHECK_OVERDRAFT:
             print(f"WARNING: После отмены <{str(self)}> счёт стал отрицательным")
         
         return True
     
     def __str__(self) -> str:
-        return f"{self.id}: DepositOperation"
+        return self._str_cache
     
     @property
     def bank_account(self) -> BankAccount:
         return self.__bank_account
     
     @property
-    def value(self) -> int:
-        return self.__value
+    def value(self) -> Decimal:
+        return _from_minor(self.__value_int)
 
 
-class WithdrawalOperation(Operation):
-    """Операция снятия средств со счёта.
+class DepositOperation(PostingOperation):
+    """Операция пополнения счёта.
     
     Attributes:
-        bank_account (BankAccount): Аккаунт, с которого снимают деньги. (readonly)
+        bank_account (BankAccount): Аккаунт, на который производится депозит. (readonly)
         value (Decimal): сколько денег (readonly)
     """
 
-    def __init__(self, bank_account: BankAccount, value: Decimal, content=''):
-        """
-        Args:
-            bank_account (BankAccount): Объект счёта, с которого будет списание.
+    __slots__ = ()
 
-        Raises:
-            ValueError: Если bank_account не является экземпляром класса BankAccount.
-            ValueError: Если value не является экземпляром класса Decimal.
-        """
-        if not isinstance(bank_account, BankAccount):
-            raise ValueError("bank_account must be instance of BankAccount class")
-        if not isinstance(value, Decimal):
-            raise ValueError("value must be instance of Decimal class")
-        
-        super().__init__()
+    _CLASS_TAG = ': DepositOperation' # хвост строки для __str__
+    _CHECK_OVERDRAFT = False # пополнение проводится всегда, даже на отрицательную сумму
 
-        self.__bank_account = bank_account
-        self.__value = value
+    @classmethod
+    def execute_many(cls, operations) -> int:
+        """Проводит сразу несколько пополнений одного счёта.
+        Баланс меняется один раз на общую сумму, история дополняется одним extend.
+        Уже выполненные или отменённые операции пропускаются.
 
-    def execute(self):
-        """Выполняет снятие со счёта.
+        Args:
+            operations (Iterable[DepositOperation]): Пополнения одного и того же счёта.
+
+        Raises:
+            ValueError: Если среди операций есть не пополнения или пополнения на отрицательную сумму.
+            ValueError: Если операции относятся к разным счетам.
 
         Returns:
-            bool: True, если операция выполнена успешно.
+            int: Сколько операций выполнено.
         """
-        if self.status != 'I': # операция уже выполнена
-            return False
-        
-        if self.bank_account._balance - self.value < 0:
-            self.__status = 'E'
-            return False
-        self.bank_account._balance -= self.value
-        self.bank_account._operation_history.append(self)
-        self.__status = 'D'
-        return True
+        operations = list(operations)
+        _require_deposits(operations)
+        # dict.fromkeys убирает повторы одной и той же операции, как повторный execute
+        pending = [operation for operation in dict.fromkeys(operations) if operation._Operation__status == _INIT]
+        if not pending:
+            return 0
 
-    def undo(self):
-        """Отменяет операцию пополнения счета.
-        Уменьшает баланс счета на ранее внесенную сумму. Уведомляет, если операция приводит к отрицательному счёту.
+        bank_account = pending[0]._PostingOperation__bank_account
+        if any(operation._PostingOperation__bank_account is not bank_account for operation in pending):
+            raise ValueError("operations must belong to the same bank account")
 
-        Returns:
-            bool: True, если операция выполнена успешно.
-        """
-        if self.status != 'D': # операция не выполнена или отменена
-            return False
+        bank_account._apply_batch(pending, sum(operation._PostingOperation__value_int for operation in pending))
+        for operation in pending:
+            operation._Operation__status = _DONE
+        return len(pending)
 
-        self.bank_account._balance += self.value
-        self.__status = 'U'
-        
-        return True
-    
-    def __str__(self) -> str:
-        return f"{self.id}: WithdrawalOperation"
-    
-    @property
-    def bank_account(self) -> BankAccount:
-        return self.__bank_account
+
+class WithdrawalOperation(PostingOperation):
+    """Операция снятия средств со счёта. Хранится как проводка с отрицательной суммой.
     
+    Attributes:
+        bank_account (BankAccount): Аккаунт, с которого снимают деньги. (readonly)
+        value (Decimal): сколько денег (readonly)
+    """
+
+    __slots__ = ()
+
+    _CLASS_TAG = ': WithdrawalOperation' # хвост строки для __str__
+
+    def _init(self, bank_account: BankAccount, value_int: int, content=''):
+        super()._init(bank_account, -value_int, content)
+
     @property
-    def value(self) -> int:
-        return self.__value
+    def value(self) -> Decimal:
+        return _from_minor(-self._PostingOperation__value_int)
 
 
 class InterestAccrualOperation(DepositOperation):
     """Представляет операцию начисления процентов на банковский счет.
+    Проценты округляются до копейки по-банковски (половина - к чётному).
     """
 
+    __slots__ = ()
+
     def __init__(self, bank_account: BankAccount, rate: Decimal):
         """
         Args:
@@ -215,5 +302,84 @@ class InterestAccrualOperation(DepositOperation):
             raise ValueError("bank_account must be instance of BankAccount class")
         if not isinstance(rate, Decimal):
             raise ValueError("rate must be instance of Decimal class")
-        
-        super().__init__(bank_account=bank_account, value=rate * bank_account.balance)
\ No newline at end of file
+
+        # ставка как точная дробь num/den: проценты считаются в копейках без Decimal
+        num, den = rate.as_integer_ratio()
+        self._init(bank_account, _div_round(bank_account._balance_int * num, den))
+
+    @classmethod
+    def accrue_all(cls, bank_accounts, rate: Decimal) -> list['InterestAccrualOperation']:
+        """Начисляет проценты сразу на несколько счетов и проводит операции.
+        Суммы считаются так же, как в __init__, при наличии numpy - одной векторной операцией.
+
+        Args:
+            bank_accounts (Iterable[BankAccount]): Счета, на которые начисляются проценты.
+            rate (Decimal): Процентная ставка.
+
+        Raises:
+            ValueError: Если какой-то из bank_accounts не является экземпляром класса BankAccount.
+            ValueError: Если rate не является экземпляром класса Decimal.
+
+        Returns:
+            list[InterestAccrualOperation]: Выполненные операции, по одной на каждый счёт.
+        """
+        if not isinstance(rate, Decimal):
+            raise ValueError("rate must be instance of Decimal class")
+
+        bank_accounts = list(bank_accounts)
+        for bank_account in bank_accounts: # до расчёта, чтобы ни один счёт не изменился
+            if not isinstance(bank_account, BankAccount):
+                raise ValueError("bank_account must be instance of BankAccount class")
+        num, den = rate.as_integer_ratio()
+        deltas = _interest_deltas([bank_account._balance_int for bank_account in bank_accounts], num, den)
+
+        operations = []
+        for bank_account, value_int in zip(bank_accounts, deltas):
+            operation = cls._cheap(bank_account, value_int)
+            bank_account._apply_batch((operation,), value_int)
+            operation._Operation__status = _DONE
+            operations.append(operation)
+        return operations
+
+
+def _require_deposits(operations):
+    '''Пакетные помощники не проверяют остаток, поэтому принимают только пополнения с неотрицательной суммой.'''
+    for operation in operations:
+        if not isinstance(operation, DepositOperation) or operation._PostingOperation__value_int < 0:
+            raise ValueError("batch operations must be deposits with non-negative value")
+
+
+def run_batch(operations) -> int:
+    """Проводит пополнения одного счёта в цикле без вызова execute на каждую операцию.
+    Для доверенного кода: принадлежность операций одному счёту не проверяется, для проверки есть DepositOperation.execute_many.
+    Уже выполненные или отменённые операции пропускаются.
+
+    Args:
+        operations (Iterable[DepositOperation]): Пополнения одного и того же счёта.
+
+    Raises:
+        ValueError: Если среди операций есть не пополнения или пополнения на отрицательную сумму.
+
+    Returns:
+        int: Сколько операций выполнено.
+    """
+    operations = list(operations)
+    _require_deposits(operations) # до первого изменения счёта
+    bank_account = None
+    history_append = None # метод append заранее, чтобы не искать его на каждой итерации
+    total = 0
+    executed = 0
+    for operation in operations:
+        if operation._Operation__status != _INIT:
+            continue
+        if bank_account is None:
+            bank_account = operation._PostingOperation__bank_account
+            history_append = bank_account._operations_history.append
+        total += operation._PostingOperation__value_int
+        history_append(operation)
+        operation._Operation__status = _DONE
+        executed += 1
+
+    if bank_account is not None:
+        bank_account._balance_int += total
+    return executed
@@ -0,0 +1,128 @@
+import unittest
+from decimal import Decimal
+
+from core import BankAccount, User
+from core.BankAccount import _div_round, _from_minor, _to_minor
+from core.Operations import DepositOperation
+
+
+def account_with_deposits(count: int, **kwargs) -> tuple[BankAccount, list[str]]:
+    account = BankAccount(User(), **kwargs)
+    operations = [DepositOperation(account, Decimal('1')) for _ in range(count)]
+    for operation in operations:
+        operation.execute()
+    return account, [str(operation) for operation in operations]
+
+
+class BankAccountTest(unittest.TestCase):
+    def test_user_checked(self):
+        with self.assertRaises(ValueError):
+            BankAccount(object())
+
+    def test_ids_unique(self):
+        self.assertNotEqual(BankAccount(User()).id, BankAccount(User()).id)
+
+    def test_new_account(self):
+        account = BankAccount(User())
+        self.assertEqual(account.balance, Decimal('0'))
+        self.assertEqual(len(account.operations_history), 0)
+
+
+class HistoryMaxlenTest(unittest.TestCase):
+    def test_oldest_dropped(self):
+        account, names = account_with_deposits(3, history_maxlen=2)
+        self.assertEqual(list(account.operations_history), names[1:])
+        self.assertEqual(account.balance, Decimal('3'))
+
+    def test_unbounded_by_default(self):
+        account, names = account_with_deposits(3)
+        self.assertEqual(list(account.operations_history), names)
+
+
+class ToMinorTest(unittest.TestCase):
+    def test_exact_amounts(self):
+        self.assertEqual(_to_minor(Decimal('10.50')), 1050)
+        self.assertEqual(_to_minor(Decimal('-3')), -300)
+        self.assertEqual(_to_minor(Decimal('1E+3')), 100000)
+
+    def test_sub_kopeck_rejected(self):
+        for value in ('10.005', '0.004'):
+            with self.assertRaises(ValueError):
+                _to_minor(Decimal(value))
+
+    def test_large_amounts_exact(self):
+        self.assertEqual(_to_minor(Decimal('1234567890123456789012345678.9')), 123456789012345678901234567890)
+        self.assertEqual(_to_minor(Decimal('-1234567890123456789012345678.91')), -123456789012345678901234567891)
+        with self.assertRaises(ValueError):
+            _to_minor(Decimal('1234567890123456789012345678.901'))
+
+    def test_from_minor_exact(self):
+        self.assertEqual(_from_minor(10 ** 40 + 1), Decimal('1' + '0' * 38 + '.01'))
+        self.assertEqual(str(_from_minor(-150)), '-1.50')
+        self.assertEqual(str(_from_minor(0)), '0.00')
+
+    def test_round_trip(self):
+        for value in ('0', '0.01', '-7.30', '99999999999999999999999999999.99'):
+            self.assertEqual(_from_minor(_to_minor(Decimal(value))), Decimal(value))
+
+    def test_non_finite_rejected(self):
+        for value in ('NaN', 'sNaN', 'Infinity', '-Infinity'):
+            with self.assertRaises(ValueError):
+                _to_minor(Decimal(value))
+
+
+class HistoryViewTest(unittest.TestCase):
+    def setUp(self):
+        self.account, self.names = account_with_deposits(3)
+
+    def test_reads_like_list(self):
+        history = self.account.operations_history
+        self.assertEqual(history, self.names)
+        self.assertEqual(history, tuple(self.names))
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history[0], self.names[0])
+        self.assertEqual(history[-1], self.names[-1])
+        self.assertEqual(history[1:], self.names[1:])
+        self.assertNotEqual(history, self.names[:2])
+        self.assertNotEqual(history, 'text')
+
+    def test_view_is_live(self):
+        history = self.account.operations_history
+        operation = DepositOperation(self.account, Decimal('1'))
+        operation.execute()
+        self.assertEqual(history, self.names + [str(operation)])
+
+    def test_posting_while_iterating(self):
+        seen = []
+        for name in self.account.operations_history:
+            seen.append(name)
+            DepositOperation(self.account, Decimal('1')).execute()
+        self.assertEqual(seen, self.names)
+        self.assertEqual(len(self.account.operations_history), 6)
+
+
+class DivRoundTest(unittest.TestCase):
+    def test_half_even(self):
+        self.assertEqual(_div_round(250, 100), 2)
+        self.assertEqual(_div_round(350, 100), 4)
+        self.assertEqual(_div_round(-250, 100), -2)
+        self.assertEqual(_div_round(-350, 100), -4)
+
+    def test_not_half(self):
+        self.assertEqual(_div_round(-505, 100), -5)
+        self.assertEqual(_div_round(-551, 100), -6)
+        self.assertEqual(_div_round(149, 100), 1)
+
+
+class HistoryTextTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(BankAccount(User()).history_text(), '')
+
+    def test_separator(self):
+        account, names = account_with_deposits(3)
+        self.assertEqual(account.history_text(), '\n'.join(names))
+        self.assertEqual(account.history_text(', '), ', '.join(names))
+
+
+if __name__ == '__main__':
+    unittest.main()
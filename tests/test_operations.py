@@ -0,0 +1,326 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from decimal import Decimal
+from unittest import mock
+
+from core import BankAccount, User
+from core import Operations
+from core.Operations import (DepositOperation, InterestAccrualOperation, PostingOperation,
+                             WithdrawalOperation, run_batch, _interest_deltas)
+
+
+def account_with(value: str) -> BankAccount:
+    '''Счёт с заданным балансом (отрицательный тоже можно: пополнение на минус проводится без проверки)'''
+    account = BankAccount(User())
+    if Decimal(value):
+        DepositOperation(account, Decimal(value)).execute()
+    return account
+
+
+class UncheckedTest(unittest.TestCase):
+    def test_without_content(self):
+        account = account_with('0')
+        deposit = DepositOperation._unchecked(account, 150)
+        self.assertIsInstance(deposit, DepositOperation)
+        self.assertEqual(deposit.value, Decimal('1.50'))
+        self.assertEqual(deposit.content, '')
+        self.assertEqual(deposit.status, 'I')
+        self.assertTrue(deposit.execute())
+        self.assertEqual(account.balance, Decimal('1.50'))
+
+    def test_with_content(self):
+        account = account_with('5')
+        withdrawal = WithdrawalOperation._unchecked(account, 200, 'cash')
+        self.assertEqual(withdrawal.value, Decimal('2'))
+        self.assertEqual(withdrawal.content, 'cash')
+        self.assertTrue(withdrawal.execute())
+        self.assertEqual(account.balance, Decimal('3'))
+
+
+class DepositTest(unittest.TestCase):
+    def test_execute_and_undo(self):
+        account = account_with('0')
+        deposit = DepositOperation(account, Decimal('10.50'), 'salary')
+        self.assertEqual(deposit.status, 'I')
+        self.assertTrue(deposit.execute())
+        self.assertEqual(account.balance, Decimal('10.50'))
+        self.assertEqual(deposit.status, 'D')
+        self.assertEqual(deposit.content, 'salary')
+        self.assertEqual(list(account.operations_history), [str(deposit)])
+        self.assertFalse(deposit.execute())
+        self.assertEqual(account.balance, Decimal('10.50'))
+
+        self.assertTrue(deposit.undo())
+        self.assertEqual(account.balance, Decimal('0'))
+        self.assertEqual(deposit.status, 'U')
+        self.assertFalse(deposit.undo())
+
+    def test_undo_to_negative_warns(self):
+        account = account_with('0')
+        deposit = DepositOperation(account, Decimal('5'))
+        deposit.execute()
+        WithdrawalOperation(account, Decimal('5')).execute()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertTrue(deposit.undo())
+        self.assertIn('WARNING', output.getvalue())
+        self.assertEqual(account.balance, Decimal('-5'))
+
+    def test_arguments_checked(self):
+        account = account_with('0')
+        with self.assertRaises(ValueError):
+            DepositOperation(object(), Decimal('1'))
+        with self.assertRaises(ValueError):
+            DepositOperation(account, 1)
+        with self.assertRaises(ValueError):
+            DepositOperation(account, Decimal('0.004'))
+
+    def test_str(self):
+        deposit = DepositOperation(account_with('0'), Decimal('1'))
+        self.assertEqual(str(deposit), f'{deposit.id}: DepositOperation')
+
+
+class WithdrawalTest(unittest.TestCase):
+    def test_execute_and_undo(self):
+        account = account_with('10')
+        withdrawal = WithdrawalOperation(account, Decimal('4'), 'rent')
+        self.assertEqual(withdrawal.value, Decimal('4'))
+        self.assertEqual(withdrawal.content, 'rent')
+        self.assertTrue(withdrawal.execute())
+        self.assertEqual(account.balance, Decimal('6'))
+        self.assertTrue(withdrawal.undo())
+        self.assertEqual(account.balance, Decimal('10'))
+        self.assertEqual(withdrawal.status, 'U')
+
+    def test_overdraft(self):
+        account = account_with('3')
+        withdrawal = WithdrawalOperation(account, Decimal('3.01'))
+        self.assertFalse(withdrawal.execute())
+        self.assertEqual(withdrawal.status, 'E')
+        self.assertEqual(account.balance, Decimal('3'))
+        self.assertEqual(len(account.operations_history), 1)
+
+    def test_whole_balance(self):
+        account = account_with('3')
+        self.assertTrue(WithdrawalOperation(account, Decimal('3')).execute())
+        self.assertEqual(account.balance, Decimal('0'))
+
+    def test_str(self):
+        withdrawal = WithdrawalOperation(account_with('0'), Decimal('1'))
+        self.assertEqual(str(withdrawal), f'{withdrawal.id}: WithdrawalOperation')
+
+
+class ExecuteManyTest(unittest.TestCase):
+    def test_deposits(self):
+        account = account_with('0')
+        deposits = [DepositOperation(account, Decimal('1.25')) for _ in range(4)]
+        deposits[0].execute()
+        self.assertEqual(DepositOperation.execute_many(iter(deposits)), 3)
+        self.assertEqual(account.balance, Decimal('5'))
+        self.assertEqual(list(account.operations_history), [str(deposit) for deposit in deposits])
+        self.assertEqual({deposit.status for deposit in deposits}, {'D'})
+        self.assertEqual(DepositOperation.execute_many([]), 0)
+
+    def test_mixed_accounts(self):
+        first, second = account_with('0'), account_with('0')
+        deposits = [DepositOperation(first, Decimal('1')), DepositOperation(second, Decimal('1'))]
+        with self.assertRaises(ValueError):
+            DepositOperation.execute_many(deposits)
+        self.assertEqual(first.balance, Decimal('0'))
+        self.assertEqual(second.balance, Decimal('0'))
+
+    def test_same_operation_twice(self):
+        account = account_with('0')
+        deposit = DepositOperation(account, Decimal('1'))
+        self.assertEqual(DepositOperation.execute_many([deposit, deposit]), 1)
+        self.assertEqual(account.balance, Decimal('1'))
+
+
+class AccrueAllTest(unittest.TestCase):
+    def test_matches_single_accrual(self):
+        balances = ['0', '0.50', '1.50', '10.99', '-1.01', '123456.78']
+        rate = Decimal('0.05')
+        expected = [InterestAccrualOperation(account_with(balance), rate).value for balance in balances]
+        accounts = [account_with(balance) for balance in balances]
+        operations = InterestAccrualOperation.accrue_all(iter(accounts), rate)
+        self.assertEqual([operation.value for operation in operations], expected)
+        for account, balance, value, operation in zip(accounts, balances, expected, operations):
+            self.assertEqual(account.balance, Decimal(balance) + value)
+            self.assertEqual(operation.status, 'D')
+            self.assertIsInstance(operation, InterestAccrualOperation)
+            self.assertEqual(account.operations_history[-1], str(operation))
+
+    def test_empty(self):
+        self.assertEqual(InterestAccrualOperation.accrue_all([], Decimal('0.05')), [])
+
+    def test_rate_checked(self):
+        with self.assertRaises(ValueError):
+            InterestAccrualOperation.accrue_all([account_with('1')], 0.05)
+
+    def test_accounts_checked(self):
+        account = account_with('1')
+        with self.assertRaises(ValueError):
+            InterestAccrualOperation.accrue_all([account, object()], Decimal('0.05'))
+        self.assertEqual(account.balance, Decimal('1'))
+        self.assertEqual(len(account.operations_history), 1)
+
+
+class InterestDeltasTest(unittest.TestCase):
+    balances = [-2 ** 63, -505, -101, -50, 0, 50, 150, 101, 10 ** 18, 2 ** 63 - 1]
+
+    @staticmethod
+    def expected(balances, num, den):
+        return [Operations._div_round(balance * num, den) for balance in balances]
+
+    def test_python_path(self):
+        with mock.patch.object(Operations, 'np', None):
+            for num, den in ((5, 100), (3, 2)):
+                self.assertEqual(_interest_deltas(self.balances, num, den), self.expected(self.balances, num, den))
+
+    @unittest.skipIf(Operations.np is None, 'numpy is not installed')
+    def test_numpy_path(self):
+        small = [-505, -101, -50, 0, 50, 150, 101, 10 ** 12]
+        for num, den in ((5, 100), (1, 2), (7, 300)):
+            self.assertEqual(_interest_deltas(small, num, den), self.expected(small, num, den))
+        # не помещается в int64 - должен сработать обычный цикл
+        self.assertEqual(_interest_deltas(self.balances, 3, 2), self.expected(self.balances, 3, 2))
+
+
+class RunBatchTest(unittest.TestCase):
+    def test_deposits(self):
+        account = account_with('0')
+        deposits = [DepositOperation(account, Decimal('1.25')) for _ in range(4)]
+        deposits[0].execute()
+        self.assertEqual(run_batch(iter(deposits)), 3)
+        self.assertEqual(account.balance, Decimal('5'))
+        self.assertEqual(list(account.operations_history), [str(deposit) for deposit in deposits])
+        self.assertEqual({deposit.status for deposit in deposits}, {'D'})
+        self.assertEqual(run_batch([]), 0)
+
+    def test_same_operation_twice(self):
+        account = account_with('0')
+        deposit = DepositOperation(account, Decimal('1'))
+        self.assertEqual(run_batch([deposit, deposit]), 1)
+        self.assertEqual(account.balance, Decimal('1'))
+
+
+class InterestTest(unittest.TestCase):
+    def test_accrual(self):
+        account = account_with('10.99')
+        interest = InterestAccrualOperation(account, Decimal('0.05'))
+        self.assertEqual(interest.value, Decimal('0.55'))
+        self.assertTrue(interest.execute())
+        self.assertEqual(account.balance, Decimal('11.54'))
+
+    def test_rounding_half_even(self):
+        self.assertEqual(InterestAccrualOperation(account_with('0.50'), Decimal('0.05')).value, Decimal('0.02'))
+        self.assertEqual(InterestAccrualOperation(account_with('1.50'), Decimal('0.05')).value, Decimal('0.08'))
+
+    def test_negative_balance(self):
+        account = account_with('-1.01')
+        interest = InterestAccrualOperation(account, Decimal('0.05'))
+        self.assertEqual(interest.value, Decimal('-0.05'))
+        self.assertTrue(interest.execute())
+        self.assertEqual(account.balance, Decimal('-1.06'))
+
+    def test_rate_checked(self):
+        with self.assertRaises(ValueError):
+            InterestAccrualOperation(account_with('1'), 0.05)
+
+
+class PostingTest(unittest.TestCase):
+    def test_negative_deposit_is_posted(self):
+        account = account_with('3')
+        deposit = DepositOperation(account, Decimal('-100'))
+        self.assertTrue(deposit.execute())
+        self.assertEqual(deposit.status, 'D')
+        self.assertEqual(account.balance, Decimal('-97'))
+
+    def test_withdrawal_checked_for_any_sign(self):
+        for value in ('-2', '0'):
+            account = account_with('-5')
+            withdrawal = WithdrawalOperation(account, Decimal(value))
+            self.assertFalse(withdrawal.execute())
+            self.assertEqual(withdrawal.status, 'E')
+            self.assertEqual(account.balance, Decimal('-5'))
+
+    def test_negative_deposit_undo_warns(self):
+        account = account_with('-5')
+        deposit = DepositOperation(account, Decimal('-1'))
+        deposit.execute()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertTrue(deposit.undo())
+        self.assertIn('WARNING', output.getvalue())
+        self.assertEqual(account.balance, Decimal('-5'))
+
+    def test_withdrawal_undo_does_not_warn(self):
+        account = account_with('5')
+        withdrawal = WithdrawalOperation(account, Decimal('5'))
+        withdrawal.execute()
+        DepositOperation(account, Decimal('-10')).execute()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertTrue(withdrawal.undo())
+        self.assertEqual(output.getvalue(), '')
+
+    def test_posting_sign(self):
+        account = account_with('1')
+        self.assertFalse(PostingOperation(account, Decimal('-2')).execute())
+        self.assertTrue(PostingOperation(account, Decimal('-1')).execute())
+        self.assertEqual(account.balance, Decimal('0'))
+
+    def test_batch_rejects_withdrawals(self):
+        for helper in (DepositOperation.execute_many, run_batch):
+            account = account_with('3')
+            operations = [DepositOperation(account, Decimal('1')), WithdrawalOperation(account, Decimal('100'))]
+            with self.assertRaises(ValueError):
+                helper(operations)
+            self.assertEqual(account.balance, Decimal('3'))
+            self.assertEqual(len(account.operations_history), 1)
+            self.assertEqual(operations[0].status, 'I')
+
+    def test_batch_rejects_negative_deposits(self):
+        for helper in (DepositOperation.execute_many, run_batch):
+            account = account_with('3')
+            with self.assertRaises(ValueError):
+                helper([DepositOperation(account, Decimal('-1'))])
+            self.assertEqual(account.balance, Decimal('3'))
+
+
+class CheapTest(unittest.TestCase):
+    def test_deposit(self):
+        account = account_with('0')
+        deposit = DepositOperation._cheap(account, 500)
+        self.assertEqual((deposit.value, deposit.content, deposit.status), (Decimal('5'), '', 'I'))
+        self.assertEqual(str(deposit), f'{deposit.id}: DepositOperation')
+        self.assertTrue(deposit.execute())
+        self.assertEqual(account.balance, Decimal('5'))
+
+    def test_withdrawal_sign(self):
+        account = account_with('5')
+        withdrawal = WithdrawalOperation._cheap(account, 100)
+        self.assertEqual(withdrawal.value, Decimal('1'))
+        self.assertTrue(withdrawal.execute())
+        self.assertEqual(account.balance, Decimal('4'))
+
+
+
+class StatusTest(unittest.TestCase):
+    def test_public_letters_over_plain_ints(self):
+        account = account_with('1')
+        withdrawal = WithdrawalOperation(account, Decimal('5'))
+        deposit = DepositOperation(account, Decimal('1'))
+        self.assertEqual(deposit.status, 'I')
+        self.assertIs(type(deposit._Operation__status), int)
+        deposit.execute()
+        withdrawal.execute()
+        self.assertEqual((deposit.status, withdrawal.status), ('D', 'E'))
+        self.assertIs(type(deposit._Operation__status), int)
+        deposit.undo()
+        self.assertEqual(deposit.status, 'U')
+        self.assertEqual(deposit._Operation__status, Operations.Status.UNDONE)
+
+if __name__ == '__main__':
+    unittest.main()